@@ -0,0 +1,124 @@
+import asyncio
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .bug import Bug
+from .bugsy import Bugsy
+from .errors import BugsyException
+from .utils import (flatten_params, parse_response)
+
+
+class AsyncBugsy(object):
+    """
+        AsyncBugsy allows fetching many Bugzilla bugs concurrently.
+
+        It needs the optional aiohttp dependency and must be used as an
+        asynchronous context manager so that a single connection pool is
+        shared by every request. It is not imported by the bugsy package
+        itself and has to be imported from bugsy.async_bugsy.
+
+        >>> from bugsy.async_bugsy import AsyncBugsy
+        >>> async with AsyncBugsy() as bugzilla:
+        ...     bugs = await bugzilla.get_many([123456, 654321])
+    """
+
+    DEFAULT_SEARCH = Bugsy.DEFAULT_SEARCH
+
+    def __init__(
+            self,
+            api_key=None,
+            bugzilla_url='https://bugzilla.mozilla.org/rest'
+    ):
+        """
+            Initialises a new instance of AsyncBugsy
+
+            :param api_key: API key to use. Defaults to None.
+            :param bugzilla_url: URL endpoint to interact with. Defaults to
+            https://bugzilla.mozilla.org/rest
+
+            Bugs returned are bound to a synchronous :class:`Bugsy` instance
+            using the same credentials, so calls such as `bug.update()` or
+            `bug.add_comment()` keep working on them.
+        """
+        if aiohttp is None:
+            raise BugsyException("AsyncBugsy requires aiohttp to be installed")
+        self.api_key = api_key
+        self.bugzilla_url = bugzilla_url
+        self.bugsy = Bugsy(api_key=api_key, bugzilla_url=bugzilla_url,
+                           warmup=False)
+        self._session = None
+
+    async def __aenter__(self):
+        if self._session is None:
+            headers = {"User-Agent": "Bugsy"}
+            if self.api_key:
+                headers['X-Bugzilla-API-Key'] = self.api_key
+            connector = aiohttp.TCPConnector(limit=32, limit_per_host=16,
+                                             ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  headers=headers)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def aget(self, bug_number, include_fields=None):
+        """
+            Get a bug from Bugzilla.
+
+            :param bug_number: Bug Number that will be searched. If found will
+                               return a Bug object.
+            :param include_fields: A string or list of fields or field filters
+                                   to include in the response output
+        """
+        fields = include_fields if include_fields else self.DEFAULT_SEARCH
+        bug = await self._request(
+            'bug/%s' % bug_number,
+            params={"include_fields": fields}
+        )
+        return Bug(self.bugsy, **bug['bugs'][0])
+
+    async def get_many(self, bug_numbers, include_fields=None):
+        """
+            Get several bugs from Bugzilla concurrently, with one request per
+            bug. Unlike :meth:`Bugsy.get_many`, the bugs are returned in the
+            same order as `bug_numbers`, and a bug that doesn't exist or is
+            not visible raises a BugsyException.
+
+            :param bug_numbers: List of bug numbers to fetch.
+            :param include_fields: A string or list of fields or field filters
+                                   to include in the response output
+        """
+        return await asyncio.gather(
+            *[self.aget(n, include_fields) for n in bug_numbers]
+        )
+
+    async def _request(self, path, method='GET', headers=None, **kwargs):
+        """Perform a HTTP request.
+
+        Given a relative Bugzilla URL path, an optional request method,
+        and arguments suitable for aiohttp.ClientSession.request(), perform
+        a HTTP request.
+        """
+        if self._session is None:
+            raise BugsyException("AsyncBugsy must be used as an async "
+                                 "context manager")
+        params = dict(kwargs.pop('params', {}))
+        if self.api_key:
+            params['Bugzilla_api_key'] = self.api_key
+        kwargs['params'] = flatten_params(params)
+        if headers is not None:
+            kwargs['headers'] = headers
+        url = '%s/%s' % (self.bugzilla_url, path)
+        async with self._session.request(method, url, **kwargs) as response:
+            return await self._handle_errors(response)
+
+    async def _handle_errors(self, response):
+        return parse_response(response.status,
+                              response.headers.get('Content-Type', ''),
+                              await response.read())
@@ -9,6 +9,7 @@ VALID_RESOLUTION = ["DUPLICATE", "FIXED", "INACTIVE", "INCOMPLETE",
                     "INVALID", "MOVED", "WONTFIX", "WORKSFORME"]
 ARRAY_TYPES = ["blocks", "cc", "cc_detail", "depends_on",
                "flags", "groups", "keywords", "see_also"]
+DEFAULT_FIELDS = ["op_sys", "product", "component", "platform", "version", "type"]
 
 
 def str2datetime(s):
@@ -48,6 +49,12 @@ class Bug(object):
         self._bug['platform'] = kwargs.get('platform', 'All')
         self._bug['version'] = kwargs.get('version', 'unspecified')
         self._bug['type'] = kwargs.get('type', 'defect')
+        if 'id' in kwargs:
+            # The defaults above only matter when filing a new bug. For a bug
+            # fetched without some of these fields they must not show up in
+            # diff(), or put() would overwrite Bugzilla's real values.
+            for key in DEFAULT_FIELDS:
+                self._copy.setdefault(key, self._bug[key])
 
     def __getattr__(self, attr):
         if attr not in self._bug:
@@ -1,15 +1,30 @@
+import threading
+from collections import OrderedDict
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from .bug import Bug
 from .errors import (BugsyException, LoginException)
 from .search import Search
+from .utils import (_loads, flatten_params, ijson, parse_response)
 
-ALLOWED_FIELDS = [
+ALLOWED_FIELDS = frozenset([
     "alias", "assigned_to", "blocked", "blocks", "cc", "comment_is_private", "comment_tags",
     "component", "dependson", "depends_on", "description", "filed_via", "flags", "groups",
     "is_markdown", "keywords", "op_sys", "platform", "priority", "product",
     "qa_contact", "regressed_by", "resolution", "severity", "status", "summary",
     "target_milestone", "type", "version", "whiteboard"
-]
+])
+
+
+def _params_key(params):
+    """
+        Turn the params given to requests into something hashable so it can
+        be used as part of a cache key.
+    """
+    return tuple(sorted(flatten_params(params)))
 
 
 class Bugsy(object):
@@ -21,6 +36,13 @@ class Bugsy(object):
                       'resolution', 'product', 'component', 'platform',
                       'whiteboard']
 
+    # Bugzilla is usually fronted by a server limiting the request line to
+    # 8KB, so cap how many bug ids are sent in a single query string.
+    MAX_BUGS_PER_REQUEST = 500
+
+    # Number of GET response bodies remembered for ETag revalidation.
+    ETAG_CACHE_SIZE = 256
+
     def __init__(
             self,
             username=None,
@@ -28,7 +50,8 @@ class Bugsy(object):
             userid=None,
             cookie=None,
             api_key=None,
-            bugzilla_url='https://bugzilla.mozilla.org/rest'
+            bugzilla_url='https://bugzilla.mozilla.org/rest',
+            warmup=True
     ):
         """
             Initialises a new instance of Bugsy
@@ -40,12 +63,15 @@ class Bugsy(object):
             :param apikey: API key to use. Defaults to None.
             :param bugzilla_url: URL endpoint to interact with. Defaults to
             https://bugzilla.mozilla.org/rest
+            :param warmup: Open the connection to Bugzilla straight away when
+            authenticating with an API key alone. Defaults to True
 
             If a api_key is passed in, Bugsy will use this for authenticating
             requests. While not required to perform requests, if a username is
             passed in along with api_key, we will validate that the api key is
             valid for this username. Otherwise the api key is blindly used
-            later.
+            later, and a cheap HEAD request is made unless warmup is False so
+            that the first real request finds a connection ready in the pool.
 
             If a username AND password are passed in Bugsy will try get a login
             token from Bugzilla. If we can't login then a LoginException will
@@ -62,8 +88,31 @@ class Bugsy(object):
         self.userid = userid
         self.cookie = cookie
         self.bugzilla_url = bugzilla_url
+        self._url_prefix = bugzilla_url.rstrip('/') + '/'
         self.token = None
         self.session = requests.Session()
+        # Keep connections to Bugzilla alive and pooled so that consecutive
+        # calls do not each pay for a new TCP and TLS handshake. Error statuses
+        # are only retried for read-only methods; a PUT may carry a comment,
+        # so repeating one after Bugzilla committed it would post it twice.
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset(['GET', 'HEAD']),
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['Connection'] = 'keep-alive'
+        self.session.headers['Accept-Encoding'] = 'gzip, deflate'
+        self.session.headers['User-Agent'] = 'Bugsy'
+        self._etag_cache = OrderedDict()
+        self._etag_lock = threading.Lock()
         self._have_auth = False
 
         # Prefer API keys over all other auth methods.
@@ -75,10 +124,22 @@ class Bugsy(object):
                     params={'login': self.username}
                 )
 
-                if type(result) == bool and not result:
-                    raise LoginException("login name doesn't match api key")
-                elif type(result) == dict:
+                if isinstance(result, dict):
                     raise LoginException(result['message'])
+                elif isinstance(result, bool) and not result:
+                    raise LoginException("login name doesn't match api key")
+            elif warmup:
+                # Nothing else uses the session yet, so it is safe to turn the
+                # adapter's retries off; an unreachable host must not stall
+                # the constructor.
+                retries = adapter.max_retries
+                adapter.max_retries = Retry(0, read=False)
+                try:
+                    self.session.head(self.bugzilla_url, timeout=2)
+                except requests.RequestException:
+                    pass
+                finally:
+                    adapter.max_retries = retries
 
             # Bugzilla 5.1+
             self.session.headers['X-Bugzilla-API-Key'] = self.api_key
@@ -145,13 +206,44 @@ class Bugsy(object):
         )
         return Bug(self, **bug['bugs'][0])
 
-    def put(self, bug):
+    def get_many(self, bug_numbers, include_fields=None):
+        """
+            Get several bugs from Bugzilla using as few requests as possible.
+
+            Bugs are returned in the order Bugzilla sends them, which need not
+            match the order of `bug_numbers`. Bugs that don't exist or that
+            you aren't allowed to see are left out instead of raising an
+            error, so the list may be shorter than `bug_numbers`.
+
+            :param bug_numbers: List of bug numbers to fetch.
+            :param include_fields: A string or list of fields or field filters
+                                   to include in the response output
+
+            >>> bugzilla = Bugsy()
+            >>> bugs = bugzilla.get_many([123456, 654321])
+        """
+        fields = include_fields if include_fields else self.DEFAULT_SEARCH
+        bug_numbers = list(bug_numbers)
+        bugs = []
+        for i in range(0, len(bug_numbers), self.MAX_BUGS_PER_REQUEST):
+            result = self.request(
+                'bug',
+                params={"id": bug_numbers[i:i + self.MAX_BUGS_PER_REQUEST],
+                        "include_fields": fields}
+            )
+            bugs.extend(Bug(self, **bug) for bug in result['bugs'])
+        return bugs
+
+    def put(self, bug, refresh=False):
         """
             This method allows you to create or update a bug on Bugzilla. You
             will have had to pass in a valid username and password to the
             object initialisation and recieved back a token.
 
             :param bug: A Bug object either created by hand or by using get()
+            :param refresh: When updating an existing bug, fetch it again from
+                            Bugzilla and return the fresh copy. Defaults to
+                            False, in which case the bug passed in is returned.
 
             If there is no valid token then a BugsyException will be raised.
             If the object passed in is not a Bug then a BugsyException will
@@ -172,7 +264,8 @@ class Bugsy(object):
                                  " to Bugzilla")
 
         if not bug.id:
-            data = {k: v for k, v in bug.to_dict().items() if k in ALLOWED_FIELDS}
+            fields = bug.to_dict()
+            data = {k: fields[k] for k in ALLOWED_FIELDS & fields.keys()}
             result = self.request('bug', 'POST', json=data)
             if 'error' not in result:
                 bug.id = result['id']
@@ -198,39 +291,84 @@ class Bugsy(object):
             if comment is not None:
                 changed['comment'] = comment
 
-            result = self.request('bug/%s' % bug.id, 'PUT',
-                                  json=changed)
-            updated_bug = self.get(bug.id)
-            return updated_bug
+            # Nothing to send, so don't bother Bugzilla with an empty update.
+            if changed:
+                self.request('bug/%s' % bug.id, 'PUT', json=changed)
+            if refresh:
+                return self.get(bug.id, include_fields=list(bug._bug.keys()))
+
+            # Bugzilla now holds our values, so they become the new baseline
+            # that future diffs are computed against.
+            bug._copy = bug._bug
+            return bug
 
     @property
     def search_for(self):
         return Search(self)
 
-    def request(self, path, method='GET', headers=None, **kwargs):
+    def request(self, path, method='GET', headers=None, stream=False,
+                **kwargs):
         """Perform a HTTP request.
 
         Given a relative Bugzilla URL path, an optional request method,
         and arguments suitable for requests.Request(), perform a
         HTTP request.
+
+        If stream is True the body is not read and the requests.Response
+        is returned instead of the decoded JSON. Error responses are still
+        raised as exceptions.
         """
-        headers = {} if headers is None else headers.copy()
-        headers["User-Agent"] = "Bugsy"
-        kwargs['headers'] = headers
-        url = '%s/%s' % (self.bugzilla_url, path)
-        return self._handle_errors(self.session.request(method, url, **kwargs))
-
-    def _handle_errors(self, response):
-        if response.status_code >= 500:
-            raise BugsyException("We received a {0} error with the following: {1}"
-                                 .format(response.status_code, response.text))
-        result = response.json()
-        if (response.status_code > 399 and response.status_code < 500) \
-            or (isinstance(result, dict) and 'error' in result and
-                result.get('error', False) is True):
-
-            if "API key" in result['message'] or "username or password" in result['message']:
-                raise LoginException(result['message'], result.get("code"))
-            else:
-                raise BugsyException(result["message"], result.get("code"))
+        if stream:
+            if headers is not None:
+                kwargs['headers'] = headers
+            url = self._url_prefix + path
+            response = self.session.request(method, url, stream=True, **kwargs)
+            if response.status_code != 200:
+                self._handle_errors(response)
+            return response
+
+        cache_key = None
+        cached = None
+        if method == 'GET':
+            cache_key = (path, _params_key(kwargs.get('params')))
+            with self._etag_lock:
+                cached = self._etag_cache.get(cache_key)
+                if cached is not None:
+                    self._etag_cache.move_to_end(cache_key)
+            if cached is not None:
+                headers = dict(headers or {})
+                headers['If-None-Match'] = cached[0]
+        if headers is not None:
+            kwargs['headers'] = headers
+        url = self._url_prefix + path
+        response = self.session.request(method, url, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            # Bugzilla confirmed our copy is current. The raw body is parsed
+            # again so every caller gets its own objects to modify.
+            return _loads(cached[1])
+        return self._handle_errors(response, cache_key)
+
+    def _iter_bugs(self, response):
+        """
+            Incrementally parse the bugs out of a streamed response.
+        """
+        if ijson is None:
+            raise BugsyException("Streaming bugs requires ijson to be installed")
+        # Let urllib3 undo any gzip or deflate transfer encoding for us.
+        response.raw.decode_content = True
+        for bug in ijson.items(response.raw, 'bugs.item', use_float=True):
+            yield Bug(self, **bug)
+
+    def _handle_errors(self, response, cache_key=None):
+        result = parse_response(response.status_code,
+                                response.headers.get('Content-Type', ''),
+                                response.content)
+        etag = response.headers.get('ETag')
+        if cache_key is not None and etag and response.status_code == 200:
+            cached = (etag, response.content)
+            with self._etag_lock:
+                self._etag_cache[cache_key] = cached
+                self._etag_cache.move_to_end(cache_key)
+                while len(self._etag_cache) > self.ETAG_CACHE_SIZE:
+                    self._etag_cache.popitem(last=False)
         return result
@@ -2,6 +2,7 @@ import copy
 
 from .bug import Bug
 from .errors import SearchException
+from .utils import ijson
 
 
 class Search(object):
@@ -172,11 +173,7 @@ class Search(object):
             ...                .include_fields("flags")\
             ...                .search()
         """
-        params = {}
-        params.update(self._time_frame.items())
-
-        if self._includefields:
-            params['include_fields'] = list(self._includefields)
+        params = self._base_params()
         if self._bug_numbers:
             bugs = []
             for bug in self._bug_numbers:
@@ -186,28 +183,71 @@ class Search(object):
 
             return bugs
         else:
-            if self._component:
-                params['component'] = list(self._component)
-            if self._product:
-                params['product'] = list(self._product)
-            if self._keywords:
-                params['keywords'] = list(self._keywords)
-            if self._assigned:
-                params['assigned_to'] = list(self._assigned)
-            if self._summaries:
-                params['short_desc_type'] = 'allwordssubstr'
-                params['short_desc'] = list(self._summaries)
-            if self._whiteboard:
-                params['short_desc_type'] = 'allwordssubstr'
-                params['whiteboard'] = list(self._whiteboard)
-            if self._change_history['fields']:
-                params['chfield'] = self._change_history['fields']
-            if self._change_history.get('value', None):
-                params['chfieldvalue'] = self._change_history['value']
-
             try:
-                results = self._bugsy.request('bug', params=params)
+                results = self._bugsy.request(
+                    'bug', params=self._search_params(params))
             except Exception as e:
                 raise SearchException(e.msg, e.code)
 
             return [Bug(self._bugsy, **bug) for bug in results['bugs']]
+
+    def search_iter(self):
+        r"""
+            Like search(), but returns an iterator that yields each bug as it
+            is parsed from the response instead of buffering the whole body.
+            This needs the optional ijson dependency and is meant for searches
+            returning a large number of bugs.
+
+            >>> for bug in bugzilla.search_for\
+            ...                    .product("Core")\
+            ...                    .search_iter():
+            ...     print(bug.id)
+        """
+        if self._bug_numbers:
+            return iter(self.search())
+        if ijson is None:
+            raise SearchException("Streaming search results requires ijson "
+                                  "to be installed")
+        return self._stream_search()
+
+    def _stream_search(self):
+        params = self._search_params(self._base_params())
+        try:
+            response = self._bugsy.request('bug', params=params, stream=True)
+        except Exception as e:
+            raise SearchException(e.msg, e.code)
+
+        try:
+            for bug in self._bugsy._iter_bugs(response):
+                yield bug
+        finally:
+            response.close()
+
+    def _base_params(self):
+        params = {}
+        params.update(self._time_frame.items())
+
+        if self._includefields:
+            params['include_fields'] = list(self._includefields)
+        return params
+
+    def _search_params(self, params):
+        if self._component:
+            params['component'] = list(self._component)
+        if self._product:
+            params['product'] = list(self._product)
+        if self._keywords:
+            params['keywords'] = list(self._keywords)
+        if self._assigned:
+            params['assigned_to'] = list(self._assigned)
+        if self._summaries:
+            params['short_desc_type'] = 'allwordssubstr'
+            params['short_desc'] = list(self._summaries)
+        if self._whiteboard:
+            params['short_desc_type'] = 'allwordssubstr'
+            params['whiteboard'] = list(self._whiteboard)
+        if self._change_history['fields']:
+            params['chfield'] = self._change_history['fields']
+        if self._change_history.get('value', None):
+            params['chfieldvalue'] = self._change_history['value']
+        return params
@@ -0,0 +1,64 @@
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+from .errors import (BugsyException, LoginException)
+
+
+def flatten_params(params):
+    """
+        Turn query arguments, given as a dict whose values may be lists or as
+        a list of pairs, into a list of (key, value) string pairs with one
+        pair per value.
+    """
+    items = params.items() if isinstance(params, dict) else (params or ())
+    pairs = []
+    for key, value in items:
+        if isinstance(value, (list, tuple)):
+            pairs.extend((str(key), str(item)) for item in value)
+        else:
+            pairs.append((str(key), str(value)))
+    return pairs
+
+
+def parse_response(status, content_type, content):
+    """
+        Decode the JSON body of a Bugzilla response, raising the matching
+        exception when Bugzilla or a proxy in front of it reports an error.
+
+        :param status: HTTP status code of the response
+        :param content_type: Value of the Content-Type header
+        :param content: Raw body as bytes
+    """
+    if status == 304:
+        raise BugsyException("We received a 304 response without having "
+                             "a cached copy")
+    if status >= 500:
+        raise BugsyException("We received a {0} error with the following: {1}"
+                             .format(status, content.decode('utf-8', 'replace')))
+    if content and 'json' not in content_type:
+        # Proxies in front of Bugzilla may answer with an HTML error page.
+        text = content[:200].decode('utf-8', 'replace')
+        raise BugsyException('HTTP {0}: {1}'.format(status, text))
+    # Parse the raw bytes directly; orjson, when available, is much faster
+    # than the standard library on large search results.
+    result = _loads(content) if content else {}
+    if (status > 399 and status < 500) \
+        or (isinstance(result, dict) and 'error' in result and
+            result.get('error', False) is True):
+
+        message = result.get('message') if isinstance(result, dict) else None
+        code = result.get('code') if isinstance(result, dict) else None
+        if not message:
+            raise BugsyException('HTTP {0}'.format(status), code)
+        if "API key" in message or "username or password" in message:
+            raise LoginException(message, code)
+        else:
+            raise BugsyException(message, code)
+    return result
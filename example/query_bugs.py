@@ -15,3 +15,8 @@ bugs = bz.search_for\
 
 for bug in bugs:
     print(f"{bug.id} - {bug.summary}")
+
+# When the bug numbers are already known, fetch them all with a single request
+# rather than calling bz.get() for each of them.
+for bug in bz.get_many([123456, 654321]):
+    print(f"{bug.id} - {bug.summary}")
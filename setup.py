@@ -15,5 +15,7 @@ setup(name='bugsy',
                   'Topic :: Software Development :: Libraries',
                   'Programming Language :: Python'],
         packages = find_packages(),
-        install_requires=['requests>=1.1.0'],
+        install_requires=['requests>=1.1.0', 'urllib3>=1.26'],
+        extras_require={'async': ['aiohttp'], 'speedups': ['orjson'],
+                      'stream': ['ijson']},
         )
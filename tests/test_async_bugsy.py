@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+import pytest
+
+from bugsy.errors import BugsyException
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+
+from bugsy.async_bugsy import AsyncBugsy  # noqa: E402
+
+
+def run_with_server(handler, coro_factory):
+    async def main():
+        app = web.Application()
+        app.router.add_route('*', '/rest/{tail:.*}', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            return await coro_factory('http://127.0.0.1:%s/rest' % port)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(main())
+
+
+def test_we_can_get_many_bugs_concurrently(bug_return):
+    seen = []
+
+    async def handler(request):
+        bug_id = int(request.match_info['tail'].split('/')[1])
+        seen.append(request)
+        bug = dict(bug_return['bugs'][0], id=bug_id)
+        return web.json_response({'bugs': [bug]})
+
+    async def fetch(url):
+        async with AsyncBugsy(api_key='goodkey', bugzilla_url=url) as bugzilla:
+            return await bugzilla.get_many([1017315, 1017316])
+
+    bugs = run_with_server(handler, fetch)
+    assert [bug.id for bug in bugs] == [1017315, 1017316]
+    assert bugs[0].summary == 'Schedule Mn tests on opt Linux builds on cedar'
+    assert seen[0].headers['User-Agent'] == 'Bugsy'
+    assert seen[0].headers['X-Bugzilla-API-Key'] == 'goodkey'
+    assert seen[0].query.getall('include_fields') == AsyncBugsy.DEFAULT_SEARCH
+
+
+def test_we_can_handle_errors_when_retrieving_bugs_asynchronously():
+    async def handler(request):
+        return web.Response(status=404, content_type='application/json',
+                            text=json.dumps({
+                                "code": 101,
+                                "error": True,
+                                "message": "Bug 111111111111 does not exist."
+                            }))
+
+    async def fetch(url):
+        async with AsyncBugsy(bugzilla_url=url) as bugzilla:
+            return await bugzilla.aget(111111111)
+
+    with pytest.raises(BugsyException) as e:
+        run_with_server(handler, fetch)
+    assert str(e.value) == "Message: Bug 111111111111 does not exist. Code: 101"
+
+
+def test_we_handle_non_json_error_pages_asynchronously():
+    async def handler(request):
+        return web.Response(status=429, content_type='text/html',
+                            text='<html><body>429 Too Many Requests</body></html>')
+
+    async def fetch(url):
+        async with AsyncBugsy(bugzilla_url=url) as bugzilla:
+            return await bugzilla.aget(123456)
+
+    with pytest.raises(BugsyException) as e:
+        run_with_server(handler, fetch)
+    assert str(e.value) == "Message: HTTP 429: <html><body>429 Too Many Requests</body></html> Code: None"
@@ -1,6 +1,8 @@
 import json
 
+import requests
 import responses
+from requests.adapters import HTTPAdapter
 
 from bugsy.bugsy import ALLOWED_FIELDS
 from bugsy import (Bugsy, Bug)
@@ -55,6 +57,18 @@ def test_validate_api_key():
     assert (responses.calls[0].request.headers['X-Bugzilla-API-Key'] ==
             'goodkey')
 
+@responses.activate
+def test_api_key_for_another_user():
+    responses.add(responses.GET,
+                  'https://bugzilla.mozilla.org/rest/valid_login?login=foo',
+                  body='false', status=200, content_type='application/json',
+                  match_querystring=True)
+    try:
+        Bugsy(username='foo', api_key='otherkey')
+        assert False, 'Should have thrown'
+    except LoginException as e:
+        assert str(e) == "Message: login name doesn't match api key Code: None"
+
 @responses.activate
 def test_we_cant_post_without_passing_a_bug_object():
     responses.add(responses.GET, 'https://bugzilla.mozilla.org/rest/login',
@@ -78,6 +92,92 @@ def test_we_can_get_a_bug(bug_return):
     assert bug.status == 'RESOLVED'
     assert bug.summary == 'Schedule Mn tests on opt Linux builds on cedar'
 
+@responses.activate
+def test_we_can_get_many_bugs_in_one_request(bug_return):
+    second_bug = dict(bug_return['bugs'][0], id=1017316)
+    responses.add(responses.GET, rest_url('bug', id=[1017315, 1017316]),
+                  body=json.dumps({'bugs': [bug_return['bugs'][0], second_bug]}),
+                  status=200, content_type='application/json',
+                  match_querystring=True)
+    bugzilla = Bugsy()
+    bugs = bugzilla.get_many([1017315, 1017316])
+    assert len(responses.calls) == 1
+    assert [bug.id for bug in bugs] == [1017315, 1017316]
+
+@responses.activate
+def test_we_split_get_many_into_chunks(bug_return):
+    responses.add(responses.GET, rest_url('bug', id=[1, 2]),
+                  body=json.dumps({'bugs': [dict(bug_return['bugs'][0], id=1),
+                                            dict(bug_return['bugs'][0], id=2)]}),
+                  status=200, content_type='application/json',
+                  match_querystring=True)
+    responses.add(responses.GET, rest_url('bug', id=[3]),
+                  body=json.dumps({'bugs': [dict(bug_return['bugs'][0], id=3)]}),
+                  status=200, content_type='application/json',
+                  match_querystring=True)
+    bugzilla = Bugsy()
+    bugzilla.MAX_BUGS_PER_REQUEST = 2
+    bugs = bugzilla.get_many([1, 2, 3])
+    assert len(responses.calls) == 2
+    assert [bug.id for bug in bugs] == [1, 2, 3]
+
+@responses.activate
+def test_we_revalidate_cached_bugs_with_etags(bug_return):
+    responses.add(responses.GET, rest_url('bug', 1017315),
+                  body=json.dumps(bug_return), status=200,
+                  content_type='application/json', match_querystring=True,
+                  headers={'ETag': '"abc123"'})
+    responses.add(responses.GET, rest_url('bug', 1017315),
+                  body='', status=304, match_querystring=True)
+    bugzilla = Bugsy()
+    bugzilla.get(1017315)
+    bug = bugzilla.get(1017315)
+    assert 'If-None-Match' not in responses.calls[0].request.headers
+    assert responses.calls[1].request.headers['If-None-Match'] == '"abc123"'
+    assert bug.id == 1017315
+    assert bug.summary == 'Schedule Mn tests on opt Linux builds on cedar'
+
+@responses.activate
+def test_changes_to_a_result_do_not_leak_into_the_etag_cache(bug_return):
+    responses.add(responses.GET, rest_url('bug', 1017315),
+                  body=json.dumps(bug_return), status=200,
+                  content_type='application/json', match_querystring=True,
+                  headers={'ETag': '"abc123"'})
+    responses.add(responses.GET, rest_url('bug', 1017315),
+                  body='', status=304, match_querystring=True)
+    responses.add(responses.GET, rest_url('bug', 1017315),
+                  body='', status=304, match_querystring=True)
+    bugzilla = Bugsy()
+    params = {'include_fields': Bugsy.DEFAULT_SEARCH}
+    bugzilla.request('bug/1017315', params=params)['bugs'][0]['keywords'].append('fresh')
+    bugzilla.request('bug/1017315', params=params)['bugs'][0]['keywords'].append('cached')
+    result = bugzilla.request('bug/1017315', params=params)
+    assert result['bugs'][0]['keywords'] == ['regression']
+
+@responses.activate
+def test_a_304_without_a_cached_copy_raises():
+    responses.add(responses.GET, rest_url('bug', 1017315),
+                  body='', status=304, match_querystring=True)
+    bugzilla = Bugsy()
+    try:
+        bugzilla.get(1017315)
+        assert False, "A BugsyException should have been thrown"
+    except BugsyException as e:
+        assert str(e) == "Message: We received a 304 response without having a cached copy Code: None"
+
+@responses.activate
+def test_the_etag_cache_is_bounded(bug_return):
+    for bug_id in (1, 2, 3):
+        responses.add(responses.GET, rest_url('bug', bug_id),
+                      body=json.dumps({'bugs': [dict(bug_return['bugs'][0], id=bug_id)]}),
+                      status=200, content_type='application/json',
+                      match_querystring=True, headers={'ETag': str(bug_id)})
+    bugzilla = Bugsy()
+    bugzilla.ETAG_CACHE_SIZE = 2
+    for bug_id in (1, 2, 3):
+        bugzilla.get(bug_id)
+    assert [etag for etag, _ in bugzilla._etag_cache.values()] == ['2', '3']
+
 @responses.activate
 def test_we_can_get_a_bug_with_login_token(bug_return):
   responses.add(responses.GET, 'https://bugzilla.mozilla.org/rest/login',
@@ -162,6 +262,100 @@ def test_we_can_put_a_current_bug(bug_return):
     assert bug.summary == 'I love foo but hate bar'
     assert bug.assigned_to == "automatedtester@mozilla.com"
 
+@responses.activate
+def test_we_do_not_refetch_a_bug_after_put_by_default(bug_return):
+    responses.add(responses.GET, 'https://bugzilla.mozilla.org/rest/login',
+                      body='{"token": "foobar"}', status=200,
+                      content_type='application/json', match_querystring=True)
+    responses.add(responses.PUT, 'https://bugzilla.mozilla.org/rest/bug/1017315',
+                      body='{"bugs": [{"id": 1017315, "changes": {}}]}', status=200,
+                      content_type='application/json')
+    bugzilla = Bugsy("foo", "bar")
+    bug = Bug(**bug_return['bugs'][0])
+    bug.summary = 'I love foo but hate bar'
+
+    assert bugzilla.put(bug) is bug
+    assert len(responses.calls) == 2
+    assert responses.calls[1].request.method == 'PUT'
+    assert 'summary' not in bug.diff()
+
+@responses.activate
+def test_we_can_refetch_a_bug_after_put(bug_return):
+    responses.add(responses.GET, 'https://bugzilla.mozilla.org/rest/login',
+                      body='{"token": "foobar"}', status=200,
+                      content_type='application/json', match_querystring=True)
+    responses.add(responses.PUT, 'https://bugzilla.mozilla.org/rest/bug/1017315',
+                      body='{"bugs": [{"id": 1017315, "changes": {}}]}', status=200,
+                      content_type='application/json')
+    responses.add(responses.GET, 'https://bugzilla.mozilla.org/rest/bug/1017315',
+                  body=json.dumps(bug_return), status=200,
+                  content_type='application/json')
+    bugzilla = Bugsy("foo", "bar")
+    bug = Bug(**bug_return['bugs'][0])
+    bug.summary = 'I love foo but hate bar'
+
+    updated_bug = bugzilla.put(bug, refresh=True)
+    assert len(responses.calls) == 3
+    assert responses.calls[2].request.method == 'GET'
+    assert 'include_fields=summary' in responses.calls[2].request.url
+    assert updated_bug.summary == 'Schedule Mn tests on opt Linux builds on cedar'
+
+@responses.activate
+def test_we_accept_an_empty_response_body(bug_return):
+    responses.add(responses.GET, 'https://bugzilla.mozilla.org/rest/login',
+                      body='{"token": "foobar"}', status=200,
+                      content_type='application/json', match_querystring=True)
+    responses.add(responses.PUT, 'https://bugzilla.mozilla.org/rest/bug/1017315',
+                      body='', status=200, content_type='application/json')
+    bugzilla = Bugsy("foo", "bar")
+    bug = Bug(**bug_return['bugs'][0])
+    bug.summary = 'I love foo but hate bar'
+
+    assert bugzilla.put(bug) is bug
+
+@responses.activate
+def test_we_do_not_put_a_bug_without_changes(bug_return):
+    responses.add(responses.GET, 'https://bugzilla.mozilla.org/rest/login',
+                      body='{"token": "foobar"}', status=200,
+                      content_type='application/json', match_querystring=True)
+    bugzilla = Bugsy("foo", "bar")
+    bug = Bug(**bug_return['bugs'][0])
+
+    assert bugzilla.put(bug) is bug
+    assert len(responses.calls) == 1
+
+@responses.activate
+def test_we_do_not_put_a_fetched_bug_without_changes(bug_return):
+    responses.add(responses.GET, 'https://bugzilla.mozilla.org/rest/login',
+                      body='{"token": "foobar"}', status=200,
+                      content_type='application/json', match_querystring=True)
+    responses.add(responses.GET, rest_url('bug', 1017315),
+                  body=json.dumps(bug_return), status=200,
+                  content_type='application/json', match_querystring=True)
+    bugzilla = Bugsy("foo", "bar")
+    bug = bugzilla.get(1017315)
+
+    assert bugzilla.put(bug) is bug
+    assert [call.request.method for call in responses.calls] == ['GET', 'GET']
+
+@responses.activate
+def test_we_put_a_bug_with_only_a_delayed_comment(bug_return):
+    responses.add(responses.GET, 'https://bugzilla.mozilla.org/rest/login',
+                      body='{"token": "foobar"}', status=200,
+                      content_type='application/json', match_querystring=True)
+    responses.add(responses.PUT, 'https://bugzilla.mozilla.org/rest/bug/1017315',
+                      body='{"bugs": [{"id": 1017315, "changes": {}}]}', status=200,
+                      content_type='application/json')
+    bugzilla = Bugsy("foo", "bar")
+    bug = Bug(**bug_return['bugs'][0])
+    bug.add_comment('I like sausages', delay=True)
+
+    bugzilla.put(bug)
+    assert len(responses.calls) == 2
+    assert json.loads(responses.calls[1].request.body) == {
+        'comment': {'body': 'I like sausages'}
+    }
+
 @responses.activate
 def test_we_handle_errors_from_bugzilla_when_posting():
   responses.add(responses.GET, 'https://bugzilla.mozilla.org/rest/login',
@@ -245,3 +439,52 @@ def test_we_can_know_when_bugsy_is_authenticated_using_apikey():
                   match_querystring=True)
     bugzilla = Bugsy(username='foo', api_key='goodkey')
     assert bugzilla.authenticated
+
+def test_we_use_a_pooled_adapter_for_connections():
+    bugzilla = Bugsy()
+    adapter = bugzilla.session.get_adapter('https://bugzilla.mozilla.org/rest')
+    assert adapter._pool_maxsize == 32
+    assert adapter.max_retries.total == 3
+    assert adapter.max_retries.allowed_methods == frozenset(['GET', 'HEAD'])
+    assert bugzilla.session.headers['Connection'] == 'keep-alive'
+
+@responses.activate
+def test_we_handle_a_trailing_slash_in_the_bugzilla_url(bug_return):
+    responses.add(responses.GET, rest_url('bug', 1017315),
+                  body=json.dumps(bug_return), status=200,
+                  content_type='application/json', match_querystring=True)
+    bugzilla = Bugsy(bugzilla_url='https://bugzilla.mozilla.org/rest/')
+    bug = bugzilla.get(1017315)
+    assert bug.id == 1017315
+
+@responses.activate
+def test_we_warm_up_the_connection_when_using_an_api_key():
+    responses.add(responses.HEAD, 'https://bugzilla.mozilla.org/rest',
+                  status=200)
+    bugzilla = Bugsy(api_key='goodkey')
+    assert bugzilla.authenticated
+    assert len(responses.calls) == 1
+    assert responses.calls[0].request.method == 'HEAD'
+
+@responses.activate
+def test_we_ignore_warm_up_failures():
+    bugzilla = Bugsy(api_key='goodkey')
+    assert bugzilla.authenticated
+
+def test_the_connection_warm_up_does_not_retry(mocker):
+    sent = []
+
+    def send(adapter, request, **kwargs):
+        sent.append((adapter.max_retries.total, kwargs['timeout']))
+        raise requests.ConnectionError()
+
+    mocker.patch.object(HTTPAdapter, 'send', autospec=True, side_effect=send)
+    bugzilla = Bugsy(api_key='goodkey')
+    assert sent == [(0, 2)]
+    adapter = bugzilla.session.get_adapter('https://bugzilla.mozilla.org/rest')
+    assert adapter.max_retries.total == 3
+
+@responses.activate
+def test_we_can_disable_the_connection_warm_up():
+    Bugsy(api_key='goodkey', warmup=False)
+    assert len(responses.calls) == 0
@@ -83,3 +83,36 @@ def test_bugsyexception_raised_for_http_500_when_adding_tags_to_bug_comments(
     with pytest.raises(BugsyException) as e:
         comments[0].add_tags("foo")
     assert str(e.value) == "Message: We received a 500 error with the following: Internal Server Error Code: None"
+
+
+@responses.activate
+def test_bugsyexception_raised_for_non_json_error_page():
+    responses.add(responses.GET, rest_url('bug', 123456),
+                  body='<html><body>429 Too Many Requests</body></html>',
+                  status=429, content_type='text/html', match_querystring=True)
+    bugzilla = Bugsy()
+    with pytest.raises(BugsyException) as e:
+        bugzilla.get(123456)
+    assert str(e.value) == "Message: HTTP 429: <html><body>429 Too Many Requests</body></html> Code: None"
+
+
+@responses.activate
+def test_bugsyexception_raised_for_empty_error_body():
+    responses.add(responses.GET, rest_url('bug', 123456),
+                  body='', status=404, content_type='application/json',
+                  match_querystring=True)
+    bugzilla = Bugsy()
+    with pytest.raises(BugsyException) as e:
+        bugzilla.get(123456)
+    assert str(e.value) == "Message: HTTP 404 Code: None"
+
+
+@responses.activate
+def test_bugsyexception_raised_for_error_body_without_message():
+    responses.add(responses.GET, rest_url('bug', 123456),
+                  body='{"error": true, "code": 51}', status=400,
+                  content_type='application/json', match_querystring=True)
+    bugzilla = Bugsy()
+    with pytest.raises(BugsyException) as e:
+        bugzilla.get(123456)
+    assert str(e.value) == "Message: HTTP 400 Code: 51"
@@ -1,5 +1,6 @@
 import json
 
+import pytest
 import responses
 
 from bugsy import (Bugsy)
@@ -556,3 +557,62 @@ def test_we_can_handle_errors_coming_back_from_search():
                 .search()
     except SearchException as e:
         assert str(e) == "Message: Can't use [Bug Creation] as a field name. Code: 108"
+
+@responses.activate
+def test_we_can_iterate_over_search_results():
+    pytest.importorskip('ijson')
+    keyword_return = {
+      "bugs" : [
+      {
+         "component" : "Networking: HTTP",
+         "product" : "Core",
+         "summary" : "IsPending broken for requests without Content-Type"
+      },
+      {
+         "component" : "Reader Mode",
+         "product" : "Firefox for Android",
+         "summary" : "Article showing twice in reader mode"
+      }]
+    }
+
+    responses.add(responses.GET, rest_url('bug', keywords='checkin-needed'),
+                    body=json.dumps(keyword_return), status=200,
+                    content_type='application/json', match_querystring=True)
+
+    bugzilla = Bugsy()
+    bugs = bugzilla.search_for\
+            .keywords('checkin-needed')\
+            .search_iter()
+
+    assert not isinstance(bugs, list)
+    bugs = list(bugs)
+    assert len(responses.calls) == 1
+    assert len(bugs) == 2
+    assert bugs[1].product == keyword_return['bugs'][1]['product']
+
+@responses.activate
+def test_we_can_handle_errors_when_iterating_over_search_results():
+    error_return = {
+        "code" : 108,
+        "error" : True,
+        "message" : "Can't use [Bug Creation] as a field name."
+    }
+    responses.add(responses.GET, rest_url('bug', chfield='[Bug Creation]'),
+                      body=json.dumps(error_return), status=400,
+                      content_type='application/json', match_querystring=True)
+
+    bugzilla = Bugsy()
+    with pytest.raises(SearchException) as e:
+        list(bugzilla.search_for
+                     .change_history_fields(['[Bug Creation]'])
+                     .search_iter())
+    assert str(e.value) == "Message: Can't use [Bug Creation] as a field name. Code: 108"
+
+@responses.activate
+def test_iterating_over_search_results_requires_ijson(monkeypatch):
+    monkeypatch.setattr('bugsy.search.ijson', None)
+    bugzilla = Bugsy()
+    with pytest.raises(SearchException) as e:
+        bugzilla.search_for.keywords('checkin-needed').search_iter()
+    assert str(e.value) == "Message: Streaming search results requires ijson to be installed Code: None"
+    assert len(responses.calls) == 0